@@ -1,132 +1,492 @@
 import os
 import json
+import errno
+import mmap
 import shutil
+import sqlite3
 import hashlib
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, scrolledtext
 
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class DataVault:
-    def __init__(self, vault_dir="data_vault"):
+    # Pre-initialised context; copying it is cheaper than building a fresh one
+    _sha256_proto = hashlib.sha256()
+    
+    def __init__(self, vault_dir="data_vault", autosave=True):
         self.vault_dir = Path(vault_dir)
         self.vault_dir.mkdir(exist_ok=True)
         self.metadata_file = self.vault_dir / "metadata.json"
+        self.db_file = self.vault_dir / "metadata.db"
         self.files_dir = self.vault_dir / "files"
         self.files_dir.mkdir(exist_ok=True)
-        self.metadata = self.load_metadata()
+        self.blobs_dir = self.vault_dir / "blobs"
+        self.hash_algorithm = "blake3" if blake3 is not None else "sha256"
+        self.autosave = autosave
+        # Shared with worker threads; every use of the connection takes the lock
+        self._lock = threading.RLock()
+        self.db = sqlite3.connect(self.db_file, isolation_level=None, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.load_metadata()
     
     def load_metadata(self):
+        schema_version = self.db.execute("PRAGMA user_version").fetchone()[0]
+        if schema_version >= 1:
+            return
+        
+        self._begin()
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                name TEXT PRIMARY KEY,
+                current_version INTEGER NOT NULL
+            )""")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS versions (
+                name TEXT NOT NULL,
+                version INTEGER NOT NULL,
+                timestamp TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                hash_algorithm TEXT NOT NULL,
+                path TEXT NOT NULL,
+                mtime_ns INTEGER,
+                source TEXT,
+                PRIMARY KEY (name, version)
+            )""")
+        
+        # One-time import of the metadata.json used by earlier releases
         if self.metadata_file.exists():
-            with open(self.metadata_file, 'r') as f:
-                return json.load(f)
-        return {}
+            data = self.metadata_file.read_bytes()
+            metadata = orjson.loads(data) if orjson is not None else json.loads(data)
+            for file_name, entry in metadata.items():
+                self.db.execute("INSERT INTO files VALUES (?, ?)",
+                                (file_name, entry["current_version"]))
+                self.db.executemany(
+                    "INSERT INTO versions VALUES (?, ?, ?, ?, ?, ?, ?, NULL, NULL)",
+                    [(file_name, v["version"], v["timestamp"], v["size"], v["hash"],
+                      v.get("hash_algorithm", "sha256"), v["path"])
+                     for v in entry["versions"]])
+        
+        self.db.execute("PRAGMA user_version = 1")
+        self.save_metadata()
     
     def save_metadata(self):
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2)
+        with self._lock:
+            if self.db.in_transaction:
+                self.db.execute("COMMIT")
+    
+    def flush(self):
+        self.save_metadata()
+    
+    def close(self):
+        with self._lock:
+            self.save_metadata()
+            self.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.db.close()
+    
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self.db.execute(sql, params).fetchall()
+    
+    def _begin(self):
+        # Mutations accumulate in one transaction until the next save
+        if not self.db.in_transaction:
+            self.db.execute("BEGIN")
+    
+    def _mark_dirty(self):
+        if self.autosave:
+            self.save_metadata()
     
     def add_file(self, source_path):
         source = Path(source_path)
-        if not source.exists():
+        try:
+            st = os.stat(source)
+            resolved = str(source.resolve())
+            unchanged = self._unchanged(source, resolved, st)
+            if unchanged is not None:
+                return unchanged
+            blob_path, file_hash, stored = self._store_blob(source)
+        except FileNotFoundError:
             return False, "File does not exist"
-        
+        except OSError as e:
+            return False, str(e)
+        
+        with self._lock:
+            try:
+                result, written = self._add_version(source, resolved, st, blob_path, file_hash)
+            except FileNotFoundError:
+                return False, "File does not exist"
+            except OSError as e:
+                return False, str(e)
+            self._sync_dirs(stored + written)
+            self._mark_dirty()
+        return result
+    
+    def add_files(self, source_paths):
+        sources = [Path(path) for path in source_paths]
+        results = [None] * len(sources)
+        jobs = []
+        with ThreadPoolExecutor() as pool:
+            for index, source in enumerate(sources):
+                try:
+                    st = os.stat(source)
+                    resolved = str(source.resolve())
+                except FileNotFoundError:
+                    results[index] = (False, f"File '{source}' does not exist")
+                    continue
+                except OSError as e:
+                    results[index] = (False, str(e))
+                    continue
+                results[index] = self._unchanged(source, resolved, st)
+                if results[index] is None:
+                    jobs.append((index, source, resolved, st, pool.submit(self._store_blob, source)))
+        
+        written = []
+        with self._lock:
+            for index, source, resolved, st, future in jobs:
+                try:
+                    blob_path, file_hash, stored = future.result()
+                    results[index], paths = self._add_version(source, resolved, st, blob_path, file_hash)
+                except FileNotFoundError:
+                    results[index] = (False, f"File '{source}' does not exist")
+                    continue
+                except OSError as e:
+                    results[index] = (False, str(e))
+                    continue
+                written += stored + paths
+            
+            self._sync_dirs(written)
+            self._mark_dirty()
+        return results
+    
+    def _unchanged(self, source, resolved, st):
+        # Same path, size and mtime as the current version: skip hashing and copying
+        rows = self._query("""
+            SELECT v.version FROM files f
+            JOIN versions v ON v.name = f.name AND v.version = f.current_version + 1
+            WHERE f.name = ? AND v.source = ? AND v.size = ? AND v.mtime_ns = ?""",
+                           (source.name, resolved, st.st_size, st.st_mtime_ns))
+        if rows:
+            return True, f"File '{source.name}' is unchanged since version {rows[0]['version']}"
+        return None
+    
+    def _blob_path(self, file_hash):
+        return self.blobs_dir / file_hash[:2] / file_hash
+    
+    def _mkdir(self, path, written):
+        # Only a directory that is actually new needs its parent synced
+        try:
+            path.mkdir()
+        except FileExistsError:
+            return
+        written.append(path)
+    
+    def _store_blob(self, source):
+        # Copy first and hash the private copy, so the blob is exactly the bytes
+        # that were hashed even if the source changes underneath us
+        written = []
+        self._mkdir(self.blobs_dir, written)
+        fd, tmp_path = tempfile.mkstemp(dir=self.blobs_dir, suffix=".tmp")
+        os.close(fd)
+        try:
+            self._copy_file(source, tmp_path)
+            file_hash = self.calculate_hash(tmp_path, length=None)
+            
+            # Content-addressed: identical content is only ever stored once,
+            # so a duplicate is discarded without paying for a flush
+            blob_path = self._blob_path(file_hash)
+            if blob_path.exists():
+                os.unlink(tmp_path)
+                return blob_path, file_hash, written
+            fd = os.open(tmp_path, os.O_RDWR)
+            try:
+                getattr(os, "fdatasync", os.fsync)(fd)
+            finally:
+                os.close(fd)
+            self._mkdir(blob_path.parent, written)
+            os.replace(tmp_path, blob_path)
+            written.append(blob_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        return blob_path, file_hash, written
+    
+    def _drop_unlinked_blob(self, blob_path):
+        # A blob no version links to any more only holds its own link
+        try:
+            if blob_path.stat().st_nlink == 1:
+                blob_path.unlink()
+        except FileNotFoundError:
+            pass
+    
+    def _add_version(self, source, resolved, st, blob_path, file_hash):
         file_name = source.name
-        file_hash = self.calculate_hash(source)
         timestamp = datetime.now().isoformat()
-        
-        if file_name not in self.metadata:
-            self.metadata[file_name] = {
-                "name": file_name,
-                "versions": [],
-                "current_version": 0
-            }
-        
-        version_num = len(self.metadata[file_name]["versions"]) + 1
+        written = []
+        
+        if not blob_path.exists():
+            # A delete running alongside the upload dropped the blob after it
+            # was stored; with the lock held it can be stored again safely
+            st = os.stat(source)
+            blob_path, file_hash, written = self._store_blob(source)
+        
+        current = self._current_version(file_name)
+        # Digests imported from metadata.json were truncated to 16 hex chars
+        if (current is not None and current["hash_algorithm"] == self.hash_algorithm
+                and file_hash.startswith(current["hash"])):
+            # Remember the new mtime/path so the next re-add skips the hash
+            self._begin()
+            self.db.execute("UPDATE versions SET mtime_ns = ?, source = ? WHERE name = ? AND version = ?",
+                            (st.st_mtime_ns, resolved, file_name, current["version"]))
+            self._drop_unlinked_blob(blob_path)
+            return (True, f"File '{file_name}' is unchanged since version {current['version']}"), written
+        
+        version_num = self.get_version_count(file_name) + 1
         version_dir = self.files_dir / file_name / f"v{version_num}"
-        version_dir.mkdir(parents=True, exist_ok=True)
+        self._mkdir(version_dir.parent, written)
+        self._mkdir(version_dir, written)
         
+        # A leftover v<N>/<name> from an uncommitted add is a link to some
+        # blob; writing through it would rewrite that blob, so drop it first
         dest = version_dir / file_name
-        shutil.copy2(source, dest)
-        
-        version_info = {
-            "version": version_num,
-            "timestamp": timestamp,
-            "size": source.stat().st_size,
-            "hash": file_hash,
-            "path": str(dest.relative_to(self.vault_dir))
-        }
-        
-        self.metadata[file_name]["versions"].append(version_info)
-        self.metadata[file_name]["current_version"] = version_num - 1
-        self.save_metadata()
-        
-        return True, f"File '{file_name}' added as version {version_num}"
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(blob_path, dest)
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                raise
+            shutil.copy2(blob_path, dest)
+        
+        self._begin()
+        self.db.execute("INSERT INTO versions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (file_name, version_num, timestamp, st.st_size,
+                         file_hash, self.hash_algorithm, str(dest.relative_to(self.vault_dir)),
+                         st.st_mtime_ns, resolved))
+        self.db.execute("""
+            INSERT INTO files VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET current_version = excluded.current_version""",
+                        (file_name, version_num - 1))
+        
+        written.append(dest)
+        return (True, f"File '{file_name}' added as version {version_num}"), written
+    
+    def _sync_dirs(self, paths):
+        # Blob data is already flushed; make the new blobs, links and
+        # directories durable with one fsync per parent directory, however
+        # many of them landed in it
+        if os.name != "posix":
+            return
+        for directory in {Path(path).parent for path in paths}:
+            fd = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+    
+    def _new_hasher(self, algorithm):
+        if algorithm == "blake3":
+            if blake3 is None:
+                raise RuntimeError("blake3 digests need the 'blake3' package installed")
+            return blake3.blake3(max_threads=blake3.blake3.AUTO)
+        if algorithm != "sha256":
+            raise ValueError(f"Unsupported hash algorithm: {algorithm}")
+        return self._sha256_proto.copy()
     
-    def calculate_hash(self, file_path):
-        sha256 = hashlib.sha256()
+    def calculate_hash(self, file_path, algorithm=None, length=16):
+        algorithm = algorithm or self.hash_algorithm
+        hasher = self._new_hasher(algorithm)
+        if algorithm == "blake3":
+            hasher.update_mmap(file_path)
+            return hasher.hexdigest()[:length]
+        
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                sha256.update(chunk)
-        return sha256.hexdigest()[:16]
+            if os.fstat(f.fileno()).st_size >= 1 << 20:
+                # Hash the page cache directly rather than copying it into read buffers
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mmap, "MADV_SEQUENTIAL"):
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    hasher.update(mm)
+                return hasher.hexdigest()[:length]
+            if hasattr(hashlib, "file_digest"):
+                return hashlib.file_digest(f, lambda: hasher).hexdigest()[:length]
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                hasher.update(chunk)
+        return hasher.hexdigest()[:length]
     
     def get_file_list(self):
-        return list(self.metadata.keys())
+        return [row["name"] for row in self._query("SELECT name FROM files ORDER BY rowid")]
     
     def get_versions(self, file_name):
-        if file_name in self.metadata:
-            return self.metadata[file_name]["versions"]
-        return []
+        rows = self._query("""
+            SELECT version, timestamp, size, hash, hash_algorithm, path
+            FROM versions WHERE name = ? ORDER BY version""", (file_name,))
+        return [dict(row) for row in rows]
+    
+    def get_version_count(self, file_name):
+        return self._query("SELECT COUNT(*) FROM versions WHERE name = ?", (file_name,))[0][0]
+    
+    def get_version_counts(self):
+        rows = self._query("""
+            SELECT f.name, COUNT(v.version) AS version_count
+            FROM files f LEFT JOIN versions v ON v.name = f.name
+            GROUP BY f.name ORDER BY f.rowid""")
+        return [(row["name"], row["version_count"]) for row in rows]
     
     def get_current_version_index(self, file_name):
-        if file_name in self.metadata:
-            return self.metadata[file_name]["current_version"]
-        return -1
+        rows = self._query("SELECT current_version FROM files WHERE name = ?", (file_name,))
+        return rows[0]["current_version"] if rows else -1
+    
+    def _current_version(self, file_name):
+        rows = self._query("""
+            SELECT v.version, v.hash, v.hash_algorithm, v.path FROM files f
+            JOIN versions v ON v.name = f.name AND v.version = f.current_version + 1
+            WHERE f.name = ?""", (file_name,))
+        return dict(rows[0]) if rows else None
     
     def rollback_version(self, file_name, version_index):
-        if file_name not in self.metadata:
-            return False, "File not found"
-        
-        versions = self.metadata[file_name]["versions"]
-        if version_index < 0 or version_index >= len(versions):
-            return False, "Invalid version index"
-        
-        self.metadata[file_name]["current_version"] = version_index
-        self.save_metadata()
+        with self._lock:
+            version_count = self.get_version_count(file_name)
+            if version_count == 0:
+                return False, "File not found"
+            
+            if version_index < 0 or version_index >= version_count:
+                return False, "Invalid version index"
+            
+            self._begin()
+            self.db.execute("UPDATE files SET current_version = ? WHERE name = ?",
+                            (version_index, file_name))
+            self._mark_dirty()
         return True, f"Rolled back to version {version_index + 1}"
     
     def export_file(self, file_name, dest_path):
-        if file_name not in self.metadata:
+        version_info = self._current_version(file_name)
+        if version_info is None:
             return False, "File not found"
         
-        current_version = self.metadata[file_name]["current_version"]
-        version_info = self.metadata[file_name]["versions"][current_version]
-        source = self.vault_dir / version_info["path"]
-        
-        if not source.exists():
-            return False, "Source file not found"
-        
-        shutil.copy2(source, dest_path)
+        return self._export_copy(self.vault_dir / version_info["path"], dest_path)
+    
+    def _export_copy(self, source, dest_path):
+        try:
+            self._copy_file(source, dest_path)
+        except OSError as e:
+            # Only a missing vault copy is "source not found"; a bad
+            # destination is reported as the OS describes it
+            if isinstance(e, FileNotFoundError) and e.filename == str(source):
+                return False, "Source file not found"
+            return False, str(e)
         return True, f"File exported to {dest_path}"
     
-    def delete_file(self, file_name):
-        if file_name not in self.metadata:
-            return False, "File not found"
-        
-        file_dir = self.files_dir / file_name
-        if file_dir.exists():
-            shutil.rmtree(file_dir)
+    def export_files(self, file_names, dest_dir):
+        # Copies are independent, so overlap their blocking syscalls on a pool
+        dest_dir = Path(dest_dir)
+        jobs = []
+        with ThreadPoolExecutor() as pool:
+            for file_name in file_names:
+                version_info = self._current_version(file_name)
+                future = None
+                if version_info is not None:
+                    future = pool.submit(self._export_copy, self.vault_dir / version_info["path"],
+                                         dest_dir / file_name)
+                jobs.append((file_name, future))
+        
+        results = []
+        for file_name, future in jobs:
+            if future is None:
+                results.append((False, f"File '{file_name}' not found"))
+                continue
+            success, message = future.result()
+            results.append((success, message if success else f"{file_name}: {message}"))
+        return results
+    
+    def _copy_file(self, source, dest):
+        # Let the kernel move the bytes (copy_file_range, then sendfile) and
+        # only bounce them through user space when neither is available
+        with open(source, 'rb') as fsrc, open(dest, 'wb') as fdst:
+            src_fd, dst_fd = fsrc.fileno(), fdst.fileno()
+            size = os.fstat(src_fd).st_size
+            offset = 0
+            
+            if hasattr(os, "copy_file_range"):
+                try:
+                    while offset < size:
+                        copied = os.copy_file_range(src_fd, dst_fd, size - offset, offset, offset)
+                        if copied == 0:
+                            break
+                        offset += copied
+                except OSError:
+                    pass
+            
+            if offset < size and hasattr(os, "sendfile"):
+                try:
+                    os.lseek(dst_fd, offset, os.SEEK_SET)
+                    while offset < size:
+                        sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                except OSError:
+                    pass
+            
+            if offset < size:
+                fsrc.seek(offset)
+                fdst.seek(offset)
+                shutil.copyfileobj(fsrc, fdst)
         
-        del self.metadata[file_name]
-        self.save_metadata()
+        shutil.copystat(source, dest)
+    
+    def delete_file(self, file_name):
+        with self._lock:
+            versions = self.get_versions(file_name)
+            if not versions:
+                return False, "File not found"
+            
+            try:
+                self._fast_rmtree(self.files_dir / file_name)
+            except FileNotFoundError:
+                pass
+            
+            for version in versions:
+                self._drop_unlinked_blob(self._blob_path(version["hash"]))
+            
+            self._begin()
+            self.db.execute("DELETE FROM versions WHERE name = ?", (file_name,))
+            self.db.execute("DELETE FROM files WHERE name = ?", (file_name,))
+            self._mark_dirty()
         return True, f"File '{file_name}' deleted"
     
+    def _fast_rmtree(self, path):
+        # Only plain directories and files live under files/, so the entry
+        # types scandir already has are enough and nothing needs an extra stat
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    self._fast_rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+        os.rmdir(path)
+    
     def format_size(self, size):
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size < 1024.0:
-                return f"{size:.2f} {unit}"
-            size /= 1024.0
-        return f"{size:.2f} TB"
+        # Each unit is 2**10 of the previous one, so the bit length picks it directly
+        units = ['B', 'KB', 'MB', 'GB', 'TB']
+        index = min((int(size).bit_length() - 1) // 10, len(units) - 1) if size >= 1 else 0
+        return f"{size / (1 << (10 * index)):.2f} {units[index]}"
 
 
 class DataVaultGUI:
@@ -136,11 +496,49 @@ class DataVaultGUI:
         self.root.geometry("1000x700")
         self.root.configure(bg='#1e1e2e')
         
-        self.vault = DataVault()
+        # Metadata writes are coalesced and flushed on a timer
+        self.vault = DataVault(autosave=False)
         self.selected_file = None
+        self._index_to_name = []
+        self._save_job = None
+        # Hashing and copying run here so large files don't freeze the UI
+        self._pool = ThreadPoolExecutor(max_workers=2)
         
         self.setup_ui()
         self.refresh_file_list()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+    
+    def schedule_save(self):
+        if self._save_job is None:
+            self._save_job = self.root.after(500, self.flush_metadata)
+    
+    def flush_metadata(self):
+        self._save_job = None
+        self.vault.flush()
+    
+    def run_in_background(self, func, *args, on_done):
+        future = self._pool.submit(func, *args)
+        self._poll_future(future, on_done)
+    
+    def _poll_future(self, future, on_done):
+        # Poll from the Tk thread so workers never have to call into Tk
+        if future.done():
+            try:
+                result = future.result()
+            except Exception as e:
+                messagebox.showerror("Error", str(e))
+                self.status_bar.config(text=f"Error: {e}")
+                return
+            on_done(result)
+        else:
+            self.root.after(50, self._poll_future, future, on_done)
+    
+    def on_close(self):
+        if self._save_job is not None:
+            self.root.after_cancel(self._save_job)
+        self._pool.shutdown(wait=True)
+        self.vault.close()
+        self.root.destroy()
     
     def setup_ui(self):
         # Header
@@ -156,7 +554,7 @@ class DataVaultGUI:
         subtitle.pack(side=tk.LEFT, padx=5, pady=20)
         
         # Upload button
-        upload_btn = tk.Button(header, text="📤 Upload File", font=('Arial', 12, 'bold'),
+        upload_btn = tk.Button(header, text="📤 Upload Files", font=('Arial', 12, 'bold'),
                               bg='#7c3aed', fg='white', command=self.upload_file,
                               relief=tk.FLAT, padx=20, pady=10, cursor='hand2')
         upload_btn.pack(side=tk.RIGHT, padx=20, pady=20)
@@ -185,6 +583,7 @@ class DataVaultGUI:
                                        selectbackground='#7c3aed',
                                        selectforeground='#ffffff',
                                        yscrollcommand=scrollbar.set,
+                                       selectmode=tk.EXTENDED,
                                        relief=tk.FLAT, highlightthickness=0)
         self.file_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.config(command=self.file_listbox.yview)
@@ -220,26 +619,28 @@ class DataVaultGUI:
                                                       state=tk.DISABLED)
         self.version_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
         
+        # Bind right-click for rollback
+        self.version_text.bind('<Button-3>', self.show_rollback_menu)
+        
         # Status bar
         self.status_bar = tk.Label(self.root, text="Ready", font=('Arial', 10),
                                   bg='#2d2d44', fg='#a6a6c8', anchor=tk.W)
         self.status_bar.pack(fill=tk.X, side=tk.BOTTOM)
     
     def refresh_file_list(self):
+        version_counts = self.vault.get_version_counts()
+        self._index_to_name = [file_name for file_name, _ in version_counts]
+        items = [f"{file_name} ({version_count} versions)"
+                 for file_name, version_count in version_counts]
         self.file_listbox.delete(0, tk.END)
-        files = self.vault.get_file_list()
-        for file_name in files:
-            versions = self.vault.get_versions(file_name)
-            self.file_listbox.insert(tk.END, f"{file_name} ({len(versions)} versions)")
+        self.file_listbox.insert(tk.END, *items)
     
     def on_file_select(self, event):
         selection = self.file_listbox.curselection()
         if not selection:
             return
         
-        index = selection[0]
-        file_text = self.file_listbox.get(index)
-        self.selected_file = file_text.split(' (')[0]
+        self.selected_file = self._index_to_name[selection[0]]
         self.show_version_history()
     
     def show_version_history(self):
@@ -252,32 +653,30 @@ class DataVaultGUI:
         versions = self.vault.get_versions(self.selected_file)
         current_idx = self.vault.get_current_version_index(self.selected_file)
         
-        self.version_text.insert(tk.END, f"File: {self.selected_file}\n")
-        self.version_text.insert(tk.END, "=" * 60 + "\n\n")
+        # Render everything into one string so the widget is updated once
+        parts = [f"File: {self.selected_file}\n", "=" * 60 + "\n\n"]
         
         for idx, version in enumerate(versions):
             is_current = idx == current_idx
             marker = ">>> CURRENT" if is_current else ""
             
-            self.version_text.insert(tk.END, f"Version {version['version']} {marker}\n")
-            self.version_text.insert(tk.END, f"  Time: {version['timestamp']}\n")
-            self.version_text.insert(tk.END, f"  Size: {self.vault.format_size(version['size'])}\n")
-            self.version_text.insert(tk.END, f"  Hash: {version['hash']}\n")
+            parts.append(f"Version {version['version']} {marker}\n")
+            parts.append(f"  Time: {version['timestamp']}\n")
+            parts.append(f"  Size: {self.vault.format_size(version['size'])}\n")
+            parts.append(f"  Hash: {version['hash'][:16]}\n")
             
             if not is_current:
                 # Add rollback button reference
-                self.version_text.insert(tk.END, f"  [To rollback, type: rollback {idx}]\n")
+                parts.append(f"  [To rollback, type: rollback {idx}]\n")
             
-            self.version_text.insert(tk.END, "\n")
+            parts.append("\n")
         
         # Add rollback instruction
-        self.version_text.insert(tk.END, "\n" + "-" * 60 + "\n")
-        self.version_text.insert(tk.END, "To rollback: Right-click and select version\n")
+        parts.append("\n" + "-" * 60 + "\n")
+        parts.append("To rollback: Right-click and select version\n")
         
+        self.version_text.insert(tk.END, "".join(parts))
         self.version_text.config(state=tk.DISABLED)
-        
-        # Bind right-click for rollback
-        self.version_text.bind('<Button-3>', self.show_rollback_menu)
     
     def show_rollback_menu(self, event):
         if not self.selected_file:
@@ -300,6 +699,7 @@ class DataVaultGUI:
         
         success, message = self.vault.rollback_version(self.selected_file, version_index)
         if success:
+            self.schedule_save()
             messagebox.showinfo("Success", message)
             self.show_version_history()
             self.status_bar.config(text=message)
@@ -307,23 +707,34 @@ class DataVaultGUI:
             messagebox.showerror("Error", message)
     
     def upload_file(self):
-        file_path = filedialog.askopenfilename(title="Select file to upload")
-        if not file_path:
+        file_paths = filedialog.askopenfilenames(title="Select files to upload")
+        if not file_paths:
             return
         
-        success, message = self.vault.add_file(file_path)
-        if success:
+        self.status_bar.config(text=f"Uploading {len(file_paths)} file(s)...")
+        self.run_in_background(self.vault.add_files, file_paths, on_done=self._on_upload_done)
+    
+    def _on_upload_done(self, results):
+        self.schedule_save()
+        message = "\n".join(message for _, message in results)
+        if all(success for success, _ in results):
             messagebox.showinfo("Success", message)
-            self.refresh_file_list()
-            self.status_bar.config(text=message)
         else:
             messagebox.showerror("Error", message)
+        
+        self.refresh_file_list()
+        self.status_bar.config(text=results[-1][1])
     
     def download_file(self):
         if not self.selected_file:
             messagebox.showwarning("Warning", "Please select a file first")
             return
         
+        selection = self.file_listbox.curselection()
+        if len(selection) > 1:
+            self.download_files([self._index_to_name[index] for index in selection])
+            return
+        
         dest_path = filedialog.asksaveasfilename(
             defaultextension="",
             initialfile=self.selected_file,
@@ -333,10 +744,35 @@ class DataVaultGUI:
         if not dest_path:
             return
         
-        success, message = self.vault.export_file(self.selected_file, dest_path)
+        file_name = self.selected_file
+        self.status_bar.config(text=f"Downloading: {file_name}...")
+        self.run_in_background(self.vault.export_file, file_name, dest_path,
+                               on_done=lambda result: self._on_download_done(file_name, result))
+    
+    def download_files(self, file_names):
+        dest_dir = filedialog.askdirectory(title="Save files to")
+        if not dest_dir:
+            return
+        
+        self.status_bar.config(text=f"Downloading {len(file_names)} files...")
+        self.run_in_background(self.vault.export_files, file_names, dest_dir,
+                               on_done=self._on_downloads_done)
+    
+    def _on_downloads_done(self, results):
+        message = "\n".join(message for _, message in results)
+        if all(success for success, _ in results):
+            messagebox.showinfo("Success", message)
+        else:
+            messagebox.showerror("Error", message)
+        
+        exported = sum(1 for success, _ in results if success)
+        self.status_bar.config(text=f"Downloaded {exported} of {len(results)} files")
+    
+    def _on_download_done(self, file_name, result):
+        success, message = result
         if success:
             messagebox.showinfo("Success", message)
-            self.status_bar.config(text=f"Downloaded: {self.selected_file}")
+            self.status_bar.config(text=f"Downloaded: {file_name}")
         else:
             messagebox.showerror("Error", message)
     
@@ -345,6 +781,11 @@ class DataVaultGUI:
             messagebox.showwarning("Warning", "Please select a file first")
             return
         
+        selection = self.file_listbox.curselection()
+        if len(selection) > 1:
+            self.delete_files([self._index_to_name[index] for index in selection])
+            return
+        
         confirm = messagebox.askyesno("Confirm Delete",
                                      f"Delete '{self.selected_file}' and all versions?")
         if not confirm:
@@ -352,6 +793,7 @@ class DataVaultGUI:
         
         success, message = self.vault.delete_file(self.selected_file)
         if success:
+            self.schedule_save()
             messagebox.showinfo("Success", message)
             self.selected_file = None
             self.refresh_file_list()
@@ -361,6 +803,31 @@ class DataVaultGUI:
             self.status_bar.config(text=f"Deleted: {self.selected_file}")
         else:
             messagebox.showerror("Error", message)
+    
+    def delete_files(self, file_names):
+        confirm = messagebox.askyesno("Confirm Delete",
+                                     f"Delete {len(file_names)} files and all their versions?")
+        if not confirm:
+            return
+        
+        results = []
+        for file_name in file_names:
+            success, message = self.vault.delete_file(file_name)
+            results.append((success, message if success else f"{file_name}: {message}"))
+        self.schedule_save()
+        message = "\n".join(message for _, message in results)
+        if all(success for success, _ in results):
+            messagebox.showinfo("Success", message)
+        else:
+            messagebox.showerror("Error", message)
+        
+        self.selected_file = None
+        self.refresh_file_list()
+        self.version_text.config(state=tk.NORMAL)
+        self.version_text.delete(1.0, tk.END)
+        self.version_text.config(state=tk.DISABLED)
+        deleted = sum(1 for success, _ in results if success)
+        self.status_bar.config(text=f"Deleted {deleted} of {len(results)} files")
 
 
 def main():